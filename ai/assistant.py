@@ -1,14 +1,14 @@
 """AI Assistant with OpenAI Function Calling"""
 import json
 from typing import List, Dict, Optional
-from openai import AsyncOpenAI
 from loguru import logger
 
 import config
+from ai.openai_client import get_openai_client
 from ai.prompts import SYSTEM_PROMPT, SYSTEM_PROMPT_MALE, SYSTEM_PROMPT_FEMALE, TOOLS
 from ai.product_search import (
     search_products,
-    get_company_info,
+    get_company_info_payload,
     format_products_list
 )
 
@@ -18,12 +18,7 @@ class AIAssistant:
     
     def __init__(self):
         """Initialize OpenAI client"""
-        # Если нужен прокси для OpenAI, раскомментируй:
-        # import httpx
-        # http_client = httpx.AsyncClient(proxies="http://proxy_address:port")
-        # self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, http_client=http_client)
-        
-        self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.model = config.OPENAI_MODEL
         logger.info(f"AI Assistant initialized with model: {self.model}")
     
@@ -149,7 +144,7 @@ class AIAssistant:
                 # Игнорируем max_results от GPT, всегда ищем больше для пагинации
                 max_results = 20
                 
-                products = search_products(query, max_results)
+                products = await search_products(query, max_results)
                 
                 # Store ALL found products and query in context (for this request only)
                 context["found_products"] = products if products else []
@@ -177,20 +172,7 @@ class AIAssistant:
                 info_type = arguments.get("info_type", "all")
                 city = arguments.get("city")
                 
-                info = get_company_info(info_type, city)
-                
-                if info:
-                    result = {
-                        "status": "success",
-                        "data": info
-                    }
-                else:
-                    result = {
-                        "status": "not_found",
-                        "message": "Информация не найдена."
-                    }
-                
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return get_company_info_payload(info_type, city)
             
             else:
                 return json.dumps({
@@ -0,0 +1,135 @@
+"""In-memory product catalog store"""
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+import config
+
+
+class CatalogStore:
+    """Product catalog loaded once, with O(1) lookups by id, api_id, slug and article"""
+
+    def __init__(self, products: List[Dict]):
+        """
+        Build lookup indexes over products.
+
+        Args:
+            products: List of product dictionaries (catalog order)
+        """
+        self.products = products
+        self.by_id: Dict[str, Dict] = {}
+        self.by_api_id: Dict[int, Dict] = {}
+        self.by_slug: Dict[str, Dict] = {}
+        self.by_article: Dict[str, Dict] = {}
+        self.by_category: Dict[str, List[Dict]] = defaultdict(list)
+
+        for product in products:
+            if product.get("id"):
+                self.by_id[product["id"]] = product
+            if product.get("api_id") is not None:
+                self.by_api_id[product["api_id"]] = product
+            if product.get("slug"):
+                self.by_slug[product["slug"]] = product
+            if product.get("article"):
+                self.by_article[product["article"]] = product
+            self.by_category[(product.get("category") or "").lower()].append(product)
+
+    @classmethod
+    def load(cls, path: Path) -> "CatalogStore":
+        """
+        Load catalog from JSON file.
+
+        Args:
+            path: Path to catalog JSON (list of products)
+
+        Returns:
+            CatalogStore instance
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            products = json.load(f)
+        logger.info(f"Loaded {len(products)} products from {path}")
+        return cls(products)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def get(self, product_id: str) -> Optional[Dict]:
+        """
+        Get product by ID (e.g. "P003").
+
+        Args:
+            product_id: Product ID
+
+        Returns:
+            Product dictionary or None
+        """
+        return self.by_id.get(product_id)
+
+    def get_by_api_id(self, api_id: int) -> Optional[Dict]:
+        """Get product by website API ID"""
+        return self.by_api_id.get(api_id)
+
+    def get_by_slug(self, slug: str) -> Optional[Dict]:
+        """Get product by URL slug"""
+        return self.by_slug.get(slug)
+
+    def get_by_article(self, article: str) -> Optional[Dict]:
+        """Get product by article number (e.g. "1-1020")"""
+        return self.by_article.get(article)
+
+    def get_category(self, category: str) -> List[Dict]:
+        """
+        Get products of a category (case-insensitive).
+
+        Args:
+            category: Category name
+
+        Returns:
+            List of products in catalog order
+        """
+        return self.by_category.get(category.lower(), [])
+
+
+# Global instance
+_catalog_store: Optional[CatalogStore] = None
+
+
+def initialize_catalog_store(path: Path = config.CATALOG_PATH) -> CatalogStore:
+    """
+    Load global catalog store.
+
+    Args:
+        path: Path to catalog JSON
+
+    Returns:
+        CatalogStore instance
+    """
+    global _catalog_store
+    _catalog_store = CatalogStore.load(path)
+    return _catalog_store
+
+
+def set_catalog_store(store: CatalogStore):
+    """
+    Replace global catalog store.
+
+    Args:
+        store: New catalog store
+    """
+    global _catalog_store
+    _catalog_store = store
+
+
+def get_catalog_store() -> CatalogStore:
+    """
+    Get global catalog store.
+
+    Returns:
+        CatalogStore instance
+    """
+    if _catalog_store is None:
+        raise RuntimeError("Catalog store not initialized! Call initialize_catalog_store() first")
+    return _catalog_store
@@ -1,223 +1,655 @@
 """Embeddings and semantic search for products"""
+import asyncio
+import hashlib
 import json
+import os
+import time
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from openai import OpenAI
 from loguru import logger
+from openai import APIConnectionError, InternalServerError, RateLimitError
 import config
+from ai.openai_client import get_openai_client
+from ai.query_cache import QueryEmbeddingCache
+from ai.lexical_index import LexicalIndex
+from ai.catalog import CatalogStore
+
+
+# Filter out very low relevance results
+MIN_SCORE_THRESHOLD = 0.25
+
+# Weight of lexical (BM25) relevance added to cosine similarity
+LEXICAL_WEIGHT = 0.15
+
+# Bump when the binary cache layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Errors worth retrying when embedding the catalog
+RETRYABLE_ERRORS = (APIConnectionError, InternalServerError, RateLimitError)
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Rough upper bound of tokens in text.
+    
+    Cyrillic text averages 2-3 characters per token, so len/2 is a safe
+    budget estimate without a tokenizer.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Estimated number of tokens
+    """
+    return len(text) // 2 + 1
 
 
 class EmbeddingsSearch:
-    """Semantic search using OpenAI embeddings"""
+    """Hybrid product search: OpenAI embeddings fused with a BM25 index"""
     
-    def __init__(self):
-        """Initialize embeddings search"""
-        # Если нужен прокси - раскомментируй следующие строки:
-        # import httpx
-        # http_client = httpx.Client(proxy="http://your-proxy:port")
-        # self.client = OpenAI(api_key=config.OPENAI_API_KEY, http_client=http_client)
+    def __init__(self, query_cache: Optional[QueryEmbeddingCache] = None):
+        """
+        Initialize embeddings search.
         
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-        self.embeddings_cache_path = Path("data/embeddings_cache.json")
+        Args:
+            query_cache: Query embeddings cache to share with a previous
+                instance (e.g. on catalog reload); a new one is created if None
+        """
+        self.client = get_openai_client()
+        self.embeddings_cache_path = config.EMBEDDINGS_CACHE_PATH
+        self.embeddings_meta_path = config.EMBEDDINGS_CACHE_PATH.with_suffix('.meta.json')
         self.catalog: List[Dict] = []
         self.embeddings: np.ndarray = None
-        self.embedding_model = "text-embedding-3-small"  # Cheap and good
+        self.lexical_index: Optional[LexicalIndex] = None
+        self.embedding_model = config.EMBEDDING_MODEL
+        self.query_cache = query_cache or QueryEmbeddingCache(
+            config.QUERY_EMBEDDINGS_CACHE_PATH,
+            model=self.embedding_model,
+            max_size=config.QUERY_EMBEDDINGS_CACHE_SIZE,
+            ttl=config.QUERY_EMBEDDINGS_CACHE_TTL
+        )
         
-    async def initialize(self, catalog: List[Dict]):
+    async def initialize(self, store: CatalogStore):
         """
         Initialize embeddings index from catalog.
         
         Args:
-            catalog: List of product dictionaries
+            store: Shared product catalog store
         """
-        self.catalog = catalog
-        logger.info(f"Initializing embeddings for {len(catalog)} products")
+        self.catalog = store.products
+        logger.info(f"Initializing embeddings for {len(self.catalog)} products")
+        
+        self.lexical_index = LexicalIndex(self.catalog)
+        
+        try:
+            await self.query_cache.open()
+        except Exception as e:
+            logger.error(f"Error opening query embeddings cache: {e}")
         
         # Try to load cached embeddings
         if self._load_cached_embeddings():
             logger.info("Loaded embeddings from cache")
             return
         
-        # Generate new embeddings
-        logger.info("Generating new embeddings (this may take a minute)...")
-        await self._generate_embeddings()
-        self._save_embeddings_cache()
-        logger.info("Embeddings generated and cached")
+        # Re-embed only new or changed products
+        await self._update_embeddings()
+        await asyncio.to_thread(self._save_embeddings_cache)
+        logger.info("Embeddings updated and cached")
     
-    def _load_cached_embeddings(self) -> bool:
+    async def close(self):
+        """Release resources held by the search (query cache connection)"""
+        stats = self.query_cache.stats()
+        logger.info(f"Query embeddings cache stats: {stats}")
+        await self.query_cache.close()
+    
+    def _read_embeddings_cache(self) -> Optional[Tuple[Dict, np.ndarray]]:
         """
-        Load embeddings from cache if available and valid.
+        Read binary cache header and memory-map its matrix.
         
         Returns:
-            True if loaded successfully, False otherwise
+            Tuple of (header, matrix) or None if cache is missing or
+            belongs to another format version or model
         """
-        if not self.embeddings_cache_path.exists():
-            return False
+        if not self.embeddings_cache_path.exists() or not self.embeddings_meta_path.exists():
+            return None
         
         try:
-            with open(self.embeddings_cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            with open(self.embeddings_meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
             
-            # Verify cache is for current catalog
-            if len(cache_data['product_ids']) != len(self.catalog):
-                logger.warning("Cache size mismatch, regenerating embeddings")
-                return False
+            if meta.get('version') != CACHE_FORMAT_VERSION or meta.get('model') != self.embedding_model:
+                logger.warning("Embeddings cache format or model changed, ignoring cache")
+                return None
             
-            # Check if product IDs match
-            current_ids = [p.get('id') for p in self.catalog]
-            if cache_data['product_ids'] != current_ids:
-                logger.warning("Product IDs changed, regenerating embeddings")
-                return False
+            embeddings = np.load(self.embeddings_cache_path, mmap_mode='r')
+            if embeddings.dtype != np.float32 or embeddings.shape != (len(meta['hashes']), meta['dim']):
+                logger.warning("Embeddings cache shape mismatch, ignoring cache")
+                return None
             
-            # Load embeddings
-            self.embeddings = np.array(cache_data['embeddings'])
-            return True
+            return meta, embeddings
             
         except Exception as e:
-            logger.error(f"Error loading embeddings cache: {e}")
+            logger.error(f"Error reading embeddings cache: {e}")
+            return None
+    
+    def _load_cached_embeddings(self) -> bool:
+        """
+        Load embeddings from the binary cache if it matches the catalog exactly.
+        
+        The matrix is memory-mapped read-only, so startup does not parse
+        anything and several bot processes share the same page cache.
+        
+        Returns:
+            True if loaded successfully, False otherwise
+        """
+        cached = self._read_embeddings_cache()
+        if cached is None:
             return False
+        
+        meta, embeddings = cached
+        if (meta['product_ids'] != [p.get('id') for p in self.catalog]
+                or meta['hashes'] != [self._content_hash(p) for p in self.catalog]):
+            logger.info("Catalog changed since embeddings were cached")
+            return False
+        
+        # Rows are stored normalized - use the mapping as is
+        self.embeddings = embeddings
+        return True
     
-    def _save_embeddings_cache(self):
-        """Save embeddings to cache"""
+    async def _update_embeddings(self):
+        """
+        Build embeddings matrix for the current catalog.
+        
+        Rows whose content hash is already in the cache are reused (in the
+        new catalog order); only added or changed products are embedded.
+        Missing products are embedded in batches bounded by size and token
+        budget, several batches at a time, with retries per batch. Finished
+        batches are checkpointed to the cache, so an interrupted run resumes
+        where it stopped.
+        """
+        cached_rows: Dict[str, np.ndarray] = {}
+        cached = self._read_embeddings_cache()
+        if cached is not None:
+            meta, embeddings = cached
+            cached_rows = {h: embeddings[i] for i, h in enumerate(meta['hashes'])}
+        
+        hashes = [self._content_hash(p) for p in self.catalog]
+        missing = [i for i, h in enumerate(hashes) if h not in cached_rows]
+        logger.info(
+            f"Reusing {len(self.catalog) - len(missing)} cached embeddings, "
+            f"embedding {len(missing)} new or changed products"
+        )
+        
+        fresh: Dict[int, np.ndarray] = {}
+        
+        def finished_rows() -> List[int]:
+            return [i for i, h in enumerate(hashes) if i in fresh or h in cached_rows]
+        
+        def row(i: int) -> np.ndarray:
+            return fresh[i] if i in fresh else cached_rows[hashes[i]]
+        
+        last_checkpoint = time.monotonic()
+        
+        async def checkpoint(force: bool = False):
+            nonlocal last_checkpoint
+            if not force and time.monotonic() - last_checkpoint < config.EMBEDDING_CHECKPOINT_INTERVAL:
+                return
+            done = finished_rows()
+            if not done:
+                return
+            await asyncio.to_thread(
+                self._write_embeddings_cache,
+                [self.catalog[i].get('id') for i in done],
+                [hashes[i] for i in done],
+                [row(i) for i in done]
+            )
+            last_checkpoint = time.monotonic()
+            logger.info(f"Embeddings checkpoint: {len(done)}/{len(hashes)} products")
+        
+        semaphore = asyncio.Semaphore(config.EMBEDDING_CONCURRENCY)
+        
+        async def run_batch(batch: List[int]):
+            async with semaphore:
+                embeddings = await self._embed_batch(
+                    [self._product_text(self.catalog[i]) for i in batch]
+                )
+            fresh.update(zip(batch, embeddings))
+        
+        batches = self._make_batches(
+            missing,
+            [self._product_text(self.catalog[i]) for i in missing]
+        )
+        if batches:
+            logger.info(f"Embedding {len(missing)} products in {len(batches)} batches")
+        
+        tasks = [asyncio.create_task(run_batch(batch)) for batch in batches]
         try:
-            cache_data = {
-                'product_ids': [p.get('id') for p in self.catalog],
-                'embeddings': self.embeddings.tolist(),
-                'model': self.embedding_model
-            }
+            for finished in asyncio.as_completed(tasks):
+                await finished
+                await checkpoint()
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await checkpoint(force=True)
+            raise
+        
+        rows = [row(i) for i in range(len(hashes))]
+        if rows:
+            self._set_embeddings(np.stack(rows))
+    
+    @staticmethod
+    def _make_batches(indices: List[int], texts: List[str]) -> List[List[int]]:
+        """
+        Split texts into request batches.
+        
+        A batch holds at most EMBEDDING_BATCH_SIZE texts and roughly
+        EMBEDDING_BATCH_TOKENS tokens.
+        
+        Args:
+            indices: Catalog indices of the texts
+            texts: Texts to embed (same order as indices)
             
-            with open(self.embeddings_cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f)
+        Returns:
+            List of batches of catalog indices
+        """
+        batches = []
+        batch: List[int] = []
+        batch_tokens = 0
+        for index, text in zip(indices, texts):
+            tokens = _estimate_tokens(text)
+            if batch and (len(batch) >= config.EMBEDDING_BATCH_SIZE
+                          or batch_tokens + tokens > config.EMBEDDING_BATCH_TOKENS):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(index)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch, retrying transient errors with exponential backoff.
+        
+        Args:
+            texts: Texts to embed
             
+        Returns:
+            Matrix of normalized embeddings (n_texts x dim)
+        """
+        for attempt in range(config.EMBEDDING_MAX_RETRIES + 1):
+            try:
+                return await self._embed_texts(texts)
+            except RETRYABLE_ERRORS as e:
+                if attempt == config.EMBEDDING_MAX_RETRIES:
+                    raise
+                delay = config.EMBEDDING_RETRY_DELAY * 2 ** attempt
+                logger.warning(f"Embedding batch failed ({e}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def _save_embeddings_cache(self):
+        """Save embeddings for the whole catalog to the binary cache"""
+        try:
+            self._write_embeddings_cache(
+                [p.get('id') for p in self.catalog],
+                [self._content_hash(p) for p in self.catalog],
+                self.embeddings
+            )
             logger.info(f"Embeddings cached to {self.embeddings_cache_path}")
             
         except Exception as e:
             logger.error(f"Error saving embeddings cache: {e}")
     
-    async def _generate_embeddings(self):
-        """Generate embeddings for all products"""
-        texts = []
-        for product in self.catalog:
-            # Combine ALL relevant fields for maximum context
-            text_parts = [
-                f"Название: {product.get('name', '')}",
-                f"Категория: {product.get('category', '')}",
-                f"Теги: {' '.join(product.get('tags', []))}",  # ALL tags
-                f"Описание: {product.get('description', '')}"  # Full description
-            ]
-            text = ' '.join(filter(None, text_parts))
-            texts.append(text)
-        
-        # Generate embeddings in batch
+    def _write_embeddings_cache(self, product_ids: List[str], hashes: List[str], embeddings):
+        """
+        Write embeddings rows to the binary cache.
+        
+        Writes a float32 .npy matrix plus a JSON header with model, dimension,
+        product IDs and content hashes. Both files are replaced atomically and
+        the header goes last, so a crash never leaves a header that
+        describes the wrong matrix.
+        
+        Args:
+            product_ids: Product ID of every row
+            hashes: Content hash of every row
+            embeddings: Normalized embeddings, one row per product
+        """
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        meta = {
+            'version': CACHE_FORMAT_VERSION,
+            'model': self.embedding_model,
+            'dim': int(matrix.shape[1]),
+            'product_ids': product_ids,
+            'hashes': hashes
+        }
+        
+        self.embeddings_meta_path.unlink(missing_ok=True)
+        
+        tmp_matrix = self.embeddings_cache_path.with_name(self.embeddings_cache_path.name + '.tmp')
+        with open(tmp_matrix, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_matrix, self.embeddings_cache_path)
+        
+        tmp_meta = self.embeddings_meta_path.with_name(self.embeddings_meta_path.name + '.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, self.embeddings_meta_path)
+    
+    @staticmethod
+    def _product_text(product: Dict) -> str:
+        """
+        Build the text that is embedded for a product.
+        
+        Args:
+            product: Product dictionary
+            
+        Returns:
+            Text combining name, category, tags and description
+        """
+        # Combine ALL relevant fields for maximum context
+        text_parts = [
+            f"Название: {product.get('name', '')}",
+            f"Категория: {product.get('category', '')}",
+            f"Теги: {' '.join(product.get('tags', []))}",  # ALL tags
+            f"Описание: {product.get('description', '')}"  # Full description
+        ]
+        return ' '.join(filter(None, text_parts))
+    
+    @classmethod
+    def _content_hash(cls, product: Dict) -> str:
+        """
+        Hash of the embedded product text.
+        
+        Args:
+            product: Product dictionary
+            
+        Returns:
+            Hex digest identifying the product content
+        """
+        return hashlib.sha1(cls._product_text(product).encode('utf-8')).hexdigest()
+    
+    async def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed product texts.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Matrix of normalized embeddings (n_texts x dim)
+        """
         try:
-            response = self.client.embeddings.create(
+            response = await self.client.embeddings.create(
                 model=self.embedding_model,
                 input=texts
             )
-            
-            embeddings_list = [item.embedding for item in response.data]
-            self.embeddings = np.array(embeddings_list)
+            return self._normalize([item.embedding for item in response.data])
             
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
             raise
     
-    def _get_query_embedding(self, query: str) -> np.ndarray:
+    def _set_embeddings(self, embeddings: np.ndarray):
         """
-        Get embedding for search query.
+        Store product embeddings as a normalized float32 matrix.
+        
+        Rows are L2-normalized once here, so cosine similarity for a query
+        becomes a single matrix-vector product at search time.
+        
+        Args:
+            embeddings: Raw embeddings matrix (n_products x dim)
+        """
+        self.embeddings = self._normalize(embeddings)
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize vectors along the last axis.
+        
+        Args:
+            vectors: Vector or matrix of vectors
+            
+        Returns:
+            C-contiguous float32 array with unit-length rows
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(vectors / norms)
+    
+    async def _get_query_embedding(self, query: str) -> np.ndarray:
+        """
+        Get normalized embedding for search query.
         
         Args:
             query: Search query text
             
         Returns:
-            Query embedding vector
+            Query embedding vector (unit length, float32)
         """
-        try:
-            response = self.client.embeddings.create(
-                model=self.embedding_model,
-                input=query
-            )
-            return np.array(response.data[0].embedding)
+        return (await self._get_query_embeddings([query]))[0]
+    
+    async def _get_query_embeddings(self, queries: List[str]) -> np.ndarray:
+        """
+        Get normalized embeddings for several queries in one API call.
+        
+        Cached queries are served from the query cache; only the rest
+        are sent to the API.
+        
+        Args:
+            queries: Search query texts
             
-        except Exception as e:
-            logger.error(f"Error getting query embedding: {e}")
-            raise
+        Returns:
+            Matrix of query embeddings (n_queries x dim, unit length rows)
+        """
+        embeddings = [await self.query_cache.get(query) for query in queries]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        if missing:
+            try:
+                response = await self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=[queries[i] for i in missing]
+                )
+            except Exception as e:
+                logger.error(f"Error getting query embedding: {e}")
+                raise
+            
+            fetched = self._normalize([item.embedding for item in response.data])
+            for i, embedding in zip(missing, fetched):
+                embeddings[i] = embedding
+                await self.query_cache.put(queries[i], embedding)
+        
+        return np.stack(embeddings)
     
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
         """
-        Calculate cosine similarity between two vectors.
+        Get indices of the k highest scores, best first.
+        
+        Uses argpartition (linear time) and sorts only the selected k.
         
         Args:
-            a: First vector
-            b: Second vector
+            scores: 1-D array of similarity scores
+            k: Number of indices to return
             
         Returns:
-            Cosine similarity score (0 to 1)
+            Array of indices sorted by score (descending)
         """
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        k = min(k, scores.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k < scores.shape[0]:
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(scores.shape[0])
+        return candidates[np.argsort(scores[candidates])[::-1]]
     
-    def search(self, query: str, max_results: int = 5) -> List[Dict]:
+    def _collect_results(self, scores: np.ndarray, max_results: int) -> List[Dict]:
         """
-        Search products using semantic similarity.
+        Turn a row of similarity scores into product results.
+        
+        Args:
+            scores: Similarity of the query to every product
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of product copies with '_similarity_score', best first
+        """
+        results = []
+        for idx in self._top_k(scores, max_results):
+            score = float(scores[idx])
+            if score < MIN_SCORE_THRESHOLD:
+                break
+            product = self.catalog[idx].copy()
+            product['_similarity_score'] = score
+            results.append(product)
+        return results
+    
+    def _lexical_results(self, query: str, max_results: int) -> List[Dict]:
+        """
+        Get products the query names exactly (article, name, transliteration).
         
         Args:
             query: Search query
             max_results: Maximum number of results to return
             
         Returns:
-            List of matching products sorted by relevance
+            List of product copies, empty if there is no strong lexical hit
         """
-        if self.embeddings is None:
-            logger.error("Embeddings not initialized!")
+        if self.lexical_index is None:
             return []
         
-        # Get query embedding
-        query_embedding = self._get_query_embedding(query)
+        results = []
+        for idx in self.lexical_index.strong_matches(query)[:max_results]:
+            product = self.catalog[idx].copy()
+            product['_similarity_score'] = 1.0
+            results.append(product)
+        return results
+    
+    def _fuse_scores(self, semantic: np.ndarray, query: str) -> np.ndarray:
+        """
+        Add weighted lexical relevance to cosine similarity.
         
-        # Calculate similarities with all products
-        similarities = []
-        for i, product_embedding in enumerate(self.embeddings):
-            similarity = self._cosine_similarity(query_embedding, product_embedding)
-            similarities.append((i, similarity))
+        Args:
+            semantic: Cosine similarity of the query to every product
+            query: Search query
+            
+        Returns:
+            Fused scores
+        """
+        if self.lexical_index is None:
+            return semantic
+        return semantic + LEXICAL_WEIGHT * self.lexical_index.relevance(query)
+    
+    async def search(self, query: str, max_results: int = 5) -> List[Dict]:
+        """
+        Search products using lexical and semantic similarity.
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Queries that name a product exactly are answered from the lexical
+        index without an embedding call.
         
-        # Get top results with minimum score threshold
-        MIN_SCORE_THRESHOLD = 0.25  # Filter out very low relevance results
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of matching products sorted by relevance
+        """
+        results = self._lexical_results(query, max_results)
+        if results:
+            logger.info(f"Lexical match for '{query}': found {len(results)} results")
+            return results
         
-        results = []
-        for idx, score in similarities[:max_results * 2]:  # Get more candidates
-            if score < MIN_SCORE_THRESHOLD:
-                continue
-            product = self.catalog[idx].copy()
-            product['_similarity_score'] = float(score)
-            results.append(product)
-            if len(results) >= max_results:
-                break
+        if self.embeddings is None:
+            logger.error("Embeddings not initialized!")
+            return []
+        
+        # Cosine similarity with all products in one matrix-vector product
+        query_embedding = await self._get_query_embedding(query)
+        scores = self._fuse_scores(self.embeddings @ query_embedding, query)
+        
+        results = self._collect_results(scores, max_results)
         
         logger.info(f"Semantic search for '{query}': found {len(results)} results")
         if results:
             logger.debug(f"Top result: {results[0].get('name')} (score: {results[0]['_similarity_score']:.3f})")
         
         return results
+    
+    async def search_many(self, queries: List[str], max_results: int = 5) -> List[List[Dict]]:
+        """
+        Search products for several queries at once.
+        
+        Queries without an exact lexical hit are embedded in one API call
+        and scored against the catalog with a single matrix-matrix product.
+        
+        Args:
+            queries: Search queries
+            max_results: Maximum number of results per query
+            
+        Returns:
+            List of result lists, in the same order as queries
+        """
+        results = [self._lexical_results(query, max_results) for query in queries]
+        pending = [i for i, found in enumerate(results) if not found]
+        if not pending:
+            return results
+        
+        if self.embeddings is None:
+            logger.error("Embeddings not initialized!")
+            return results
+        
+        query_embeddings = await self._get_query_embeddings([queries[i] for i in pending])
+        scores = query_embeddings @ self.embeddings.T
+        
+        for i, row in zip(pending, scores):
+            results[i] = self._collect_results(self._fuse_scores(row, queries[i]), max_results)
+        
+        logger.info(
+            f"Semantic batch search for {len(queries)} queries: "
+            f"found {sum(len(r) for r in results)} results"
+        )
+        return results
 
 
 # Global instance
 _embeddings_search: Optional[EmbeddingsSearch] = None
 
 
-async def initialize_embeddings_search(catalog: List[Dict]):
+async def initialize_embeddings_search(store: CatalogStore):
     """
     Initialize global embeddings search instance.
     
     Args:
-        catalog: Product catalog
+        store: Product catalog store
     """
     global _embeddings_search
     _embeddings_search = EmbeddingsSearch()
-    await _embeddings_search.initialize(catalog)
+    await _embeddings_search.initialize(store)
+
+
+def set_embeddings_search(search: EmbeddingsSearch):
+    """
+    Replace global embeddings search instance.
+    
+    Requests already holding the previous instance finish on it.
+    
+    Args:
+        search: Initialized EmbeddingsSearch
+    """
+    global _embeddings_search
+    _embeddings_search = search
+
+
+async def close_embeddings_search():
+    """Close global embeddings search instance"""
+    global _embeddings_search
+    if _embeddings_search is not None:
+        await _embeddings_search.close()
+        _embeddings_search = None
 
 
 def get_embeddings_search() -> EmbeddingsSearch:
@@ -0,0 +1,186 @@
+"""City index for pickup point lookups"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from ai.lexical_index import normalize_text, stem
+
+
+# Words that surround a city name in queries ("в Казани", "г. Москва")
+CITY_STOPWORDS = {
+    "в", "во", "г", "гор", "город", "городе", "из", "по", "на", "для", "около", "рядом",
+    "in", "city", "of",
+}
+
+# Colloquial names and English exonyms
+CITY_ALIASES = {
+    "спб": "Санкт-Петербург",
+    "питер": "Санкт-Петербург",
+    "петербург": "Санкт-Петербург",
+    "saint petersburg": "Санкт-Петербург",
+    "st petersburg": "Санкт-Петербург",
+    "мск": "Москва",
+    "moscow": "Москва",
+    "екб": "Екатеринбург",
+    "нск": "Новосибирск",
+}
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.6
+
+_TRANSLIT = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh", "з": "z",
+    "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch",
+    "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+
+_WORD_RE = re.compile(r"[0-9a-zа-я]+")
+_VOWELS = "аеиоуыэюя"
+
+
+def transliterate(text: str) -> str:
+    """
+    Transliterate Cyrillic text to Latin.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        Latin transliteration
+    """
+    return "".join(_TRANSLIT.get(ch, ch) for ch in text)
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """
+    Dice coefficient over character trigrams.
+
+    Args:
+        a: First string
+        b: Second string
+
+    Returns:
+        Similarity from 0 to 1
+    """
+    def trigrams(s: str) -> Set[str]:
+        s = f"  {s} "
+        return {s[i:i + 3] for i in range(len(s) - 2)}
+
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return 2 * len(ta & tb) / (len(ta) + len(tb))
+
+
+def _city_words(text: str) -> List[str]:
+    """Normalized words of a city query without surrounding stopwords"""
+    return [w for w in _WORD_RE.findall(normalize_text(text)) if w not in CITY_STOPWORDS]
+
+
+def _stem_word(word: str) -> str:
+    """Stem a city word, also handling short names (Уфа) and fleeting vowels (Орел -> орл)"""
+    stemmed = stem(word)
+    if stemmed != word:
+        return stemmed
+    if len(word) == 3 and word[-1] in _VOWELS:
+        return word[:-1]
+    if len(word) >= 4 and word[-2] in "ео" and word[-1] not in _VOWELS:
+        return word[:-2] + word[-1]
+    return word
+
+
+def city_keys(text: str) -> Set[str]:
+    """
+    Lookup keys for a city name or query.
+
+    Includes the normalized name, its stemmed form (so "Москве" and
+    "Москва" share a key) and the Latin transliteration of both.
+
+    Args:
+        text: City name or query
+
+    Returns:
+        Set of keys
+    """
+    words = _city_words(text)
+    if not words:
+        return set()
+    plain = " ".join(words)
+    stemmed = " ".join(_stem_word(w) for w in words)
+    return {plain, stemmed, transliterate(plain), transliterate(stemmed)}
+
+
+class CityIndex:
+    """Index of pickup points by city with declension, transliteration and fuzzy matching"""
+
+    def __init__(self, locations: List[Dict]):
+        """
+        Build index from geography data.
+
+        Args:
+            locations: List of pickup point dictionaries with "city"
+        """
+        self.locations = locations
+        self.by_city: Dict[str, List[Dict]] = defaultdict(list)
+        self.keys: Dict[str, Set[str]] = defaultdict(set)
+
+        for location in locations:
+            city = location.get("city", "")
+            if not city:
+                continue
+            self.by_city[city].append(location)
+            for key in city_keys(city):
+                self.keys[key].add(city)
+
+        for alias, city in CITY_ALIASES.items():
+            if city in self.by_city:
+                self.keys[alias].add(city)
+
+    @property
+    def cities(self) -> List[str]:
+        """Sorted list of indexed city names"""
+        return sorted(self.by_city)
+
+    def match_cities(self, query: str) -> List[str]:
+        """
+        Find city names matching query.
+
+        Args:
+            query: City name in any case form, Latin or with typos
+
+        Returns:
+            Sorted list of matching city names (empty if nothing matches)
+        """
+        query_keys = city_keys(query)
+        if not query_keys:
+            return []
+
+        found: Set[str] = set()
+        for key in query_keys:
+            found |= self.keys.get(key, set())
+        if found:
+            return sorted(found)
+
+        # Fuzzy: best trigram similarity of any query key to any city key
+        scores: Dict[str, float] = {}
+        for key, cities in self.keys.items():
+            score = max(trigram_similarity(q, key) for q in query_keys)
+            for city in cities:
+                scores[city] = max(scores.get(city, 0.0), score)
+        best = max(scores.values(), default=0.0)
+        if best < FUZZY_THRESHOLD:
+            return []
+        return sorted(city for city, score in scores.items() if score >= best - 0.05)
+
+    def find(self, query: str) -> List[Dict]:
+        """
+        Find pickup points in the city named by query.
+
+        Args:
+            query: City name
+
+        Returns:
+            List of matching locations (empty if the city is unknown)
+        """
+        return [location for city in self.match_cities(query) for location in self.by_city[city]]
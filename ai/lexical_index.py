@@ -0,0 +1,247 @@
+"""Lexical (BM25) index over product names, tags, articles and categories"""
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# Field weights for BM25F-style term frequency
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "article": 3.0,
+    "tags": 1.5,
+    "category": 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A tag equal to the whole query is a strong hit only if its terms occur in
+# at most this many products (transliterated names, not words like "мозг")
+STRONG_TAG_MAX_DF = 3
+
+STOPWORDS = {
+    "а", "и", "в", "во", "на", "с", "со", "к", "ко", "о", "об", "по", "от", "до", "из",
+    "у", "за", "для", "не", "ни", "или", "ли", "же", "бы", "что", "как", "какой", "какие",
+    "это", "мне", "меня", "я", "вы", "вас", "есть", "хочу", "нужен",
+    "нужна", "нужно", "нужны", "покажи", "покажите", "посоветуй", "посоветуйте",
+    "порекомендуй", "порекомендуйте", "подскажи", "подскажите", "артикул",
+    "the", "and", "for", "of",
+}
+
+# Russian inflection endings, longest first
+_ENDINGS = sorted([
+    "иями", "ями", "ами", "ией", "иям", "ием", "иях", "ого", "его", "ому", "ему", "ыми",
+    "ими", "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ие", "ые", "ом", "ем", "ам",
+    "ям", "ах", "ях", "ов", "ев", "ую", "юю", "ия", "ья", "ью", "а", "я", "о", "е", "и",
+    "ы", "у", "ю", "ь", "й",
+], key=len, reverse=True)
+
+_TOKEN_RE = re.compile(r"[0-9a-zа-я]+(?:-[0-9a-zа-я]+)*")
+_CYRILLIC_RE = re.compile(r"[а-я]")
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for lexical matching.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercased text with ё replaced by е
+    """
+    return (text or "").lower().replace("ё", "е")
+
+
+def stem(word: str) -> str:
+    """
+    Strip a Russian inflection ending.
+
+    Args:
+        word: Normalized word
+
+    Returns:
+        Word stem (Latin words and numbers are returned as is)
+    """
+    if not _CYRILLIC_RE.search(word):
+        return word
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[:-len(ending)]
+    return word
+
+
+def words(text: str) -> List[str]:
+    """
+    Split text into normalized words without stopwords.
+
+    Hyphenated words are split into parts, hyphenated codes with digits
+    (articles like "1-1020") are kept whole.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of words
+    """
+    result = []
+    for token in _TOKEN_RE.findall(normalize_text(text)):
+        if "-" in token and not any(ch.isdigit() for ch in token):
+            parts = token.split("-")
+        else:
+            parts = [token]
+        result.extend(part for part in parts if part and part not in STOPWORDS)
+    return result
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into stemmed terms.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of terms
+    """
+    return [stem(word) for word in words(text)]
+
+
+def _phrase_key(text: str) -> str:
+    """Key for whole-phrase matching: words without stopwords joined by space"""
+    return " ".join(words(text))
+
+
+class LexicalIndex:
+    """Inverted index with BM25 scoring over catalog products"""
+
+    def __init__(self, catalog: List[Dict]):
+        """
+        Build index from catalog.
+
+        Args:
+            catalog: List of product dictionaries
+        """
+        self.size = len(catalog)
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self.articles: Dict[str, List[int]] = defaultdict(list)
+        self.phrases: Dict[str, List[int]] = defaultdict(list)
+        self.tag_phrases: Dict[str, List[int]] = defaultdict(list)
+        doc_lengths = np.zeros(self.size, dtype=np.float32)
+
+        for i, product in enumerate(catalog):
+            fields = {
+                "name": product.get("name", ""),
+                "article": product.get("article", ""),
+                "tags": " ".join(product.get("tags", [])),
+                "category": product.get("category", ""),
+            }
+            tf: Counter = Counter()
+            for field, text in fields.items():
+                terms = tokenize(text or "")
+                weight = FIELD_WEIGHTS[field]
+                for term in terms:
+                    tf[term] += weight
+                doc_lengths[i] += weight * len(terms)
+            for term, freq in tf.items():
+                self.postings[term].append((i, freq))
+
+            if product.get("article"):
+                self.articles[normalize_text(product["article"]).strip()].append(i)
+
+            name = product.get("name", "")
+            for key in {_phrase_key(name), _phrase_key(_PARENTHESES_RE.sub(" ", name))}:
+                if key:
+                    self.phrases[key].append(i)
+
+            for tag in set(product.get("tags", [])):
+                key = _phrase_key(tag)
+                if key:
+                    self.tag_phrases[key].append(i)
+
+        avg_length = float(doc_lengths.mean()) if self.size else 0.0
+        self._length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / (avg_length or 1.0))
+        self.idf = {
+            term: math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def bm25(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every product against query with BM25.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Tuple of (BM25 scores, fraction of query terms matched) per product
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=np.float32)
+        terms = set(tokenize(query))
+        for term in terms:
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc, freq in self.postings[term]:
+                scores[doc] += idf * freq * (BM25_K1 + 1) / (freq + self._length_norm[doc])
+                matched[doc] += 1
+        if terms:
+            matched /= len(terms)
+        return scores, matched
+
+    def relevance(self, query: str) -> np.ndarray:
+        """
+        Lexical relevance of every product in [0, 1].
+
+        BM25 scaled by the best score and by the share of query terms the
+        product matches, so one common word in a long query adds little.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Relevance per product
+        """
+        scores, matched = self.bm25(query)
+        top = scores.max() if self.size else 0.0
+        if top <= 0:
+            return scores
+        return scores / top * matched
+
+    def strong_matches(self, query: str) -> List[int]:
+        """
+        Find products the query names exactly.
+
+        A strong match is an article contained in the query, a query equal
+        to a product name (with or without its parenthesized variant), or a
+        query equal to a rare tag such as a transliterated product name.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Product indices ranked by BM25, empty if there is no strong match
+        """
+        key = _phrase_key(query)
+        if not key:
+            return []
+
+        hits = []
+        for word in key.split():
+            hits.extend(self.articles.get(word, []))
+        if not hits:
+            hits = list(self.phrases.get(key, []))
+        if not hits and all(
+            len(self.postings.get(term, ())) <= STRONG_TAG_MAX_DF for term in tokenize(key)
+        ):
+            hits = list(self.tag_phrases.get(key, []))
+        if not hits:
+            return []
+
+        scores, _ = self.bm25(query)
+        return sorted(set(hits), key=lambda i: scores[i], reverse=True)
@@ -0,0 +1,40 @@
+"""Shared async OpenAI client"""
+from typing import Optional
+from openai import AsyncOpenAI
+from loguru import logger
+
+import config
+
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get shared async OpenAI client.
+
+    One client means one HTTP connection pool for chat completions and
+    embeddings, so concurrent requests reuse keep-alive connections.
+
+    Returns:
+        AsyncOpenAI instance
+    """
+    global _client
+    if _client is None:
+        # Если нужен прокси для OpenAI, раскомментируй:
+        # import httpx
+        # http_client = httpx.AsyncClient(proxy="http://proxy_address:port")
+        # _client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, http_client=http_client)
+
+        _client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+        logger.info("OpenAI client initialized")
+    return _client
+
+
+async def close_openai_client():
+    """Close shared OpenAI client and its connection pool"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+        logger.info("OpenAI client closed")
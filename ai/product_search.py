@@ -1,9 +1,12 @@
 """Product search in catalog - Semantic Search version"""
 import json
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from loguru import logger
 import config
+from ai.geography import CityIndex
 
 
 def load_json_file(file_path: Path) -> any:
@@ -24,7 +27,7 @@ def load_json_file(file_path: Path) -> any:
         return None
 
 
-def search_products(query: str, max_results: int = 5) -> List[Dict]:
+async def search_products(query: str, max_results: int = 5) -> List[Dict]:
     """
     Search products using semantic search.
     
@@ -39,7 +42,7 @@ def search_products(query: str, max_results: int = 5) -> List[Dict]:
     
     try:
         embeddings_search = get_embeddings_search()
-        results = embeddings_search.search(query, max_results=max_results)
+        results = await embeddings_search.search(query, max_results=max_results)
         
         logger.info(f"Found {len(results)} products for query '{query}'")
         return results
@@ -50,10 +53,96 @@ def search_products(query: str, max_results: int = 5) -> List[Dict]:
         return []
 
 
+# Parsed company data files: source name -> (mtime_ns, data)
+_json_cache: Dict[str, Tuple[int, Any]] = {}
+# Modification times of company data files and when they were last checked
+_data_versions_cache: Optional[Dict[str, int]] = None
+_data_versions_checked_at = 0.0
+# City index over geography data: (mtime_ns, index)
+_city_index_cache: Optional[Tuple[int, CityIndex]] = None
+# Serialized get_company_info tool results: (info_type, city, versions) -> JSON
+_payload_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+PAYLOAD_CACHE_SIZE = 256
+
+
+def _company_sources() -> Dict[str, Path]:
+    """Company data files by info type"""
+    return {
+        "company": config.COMPANY_PATH,
+        "business": config.BUSINESS_PATH,
+        "events": config.EVENTS_PATH,
+        "geography": config.GEOGRAPHY_PATH,
+    }
+
+
+def _data_versions() -> Dict[str, int]:
+    """
+    Get modification times of company data files.
+    
+    Files are stat'ed at most every COMPANY_DATA_CHECK_INTERVAL seconds.
+    
+    Returns:
+        Dictionary of source name -> mtime in nanoseconds (0 if missing)
+    """
+    global _data_versions_cache, _data_versions_checked_at
+    
+    now = time.monotonic()
+    if _data_versions_cache is None or now - _data_versions_checked_at >= config.COMPANY_DATA_CHECK_INTERVAL:
+        versions = {}
+        for name, path in _company_sources().items():
+            try:
+                versions[name] = path.stat().st_mtime_ns
+            except OSError:
+                versions[name] = 0
+        _data_versions_cache, _data_versions_checked_at = versions, now
+    return _data_versions_cache
+
+
+def _load_company_source(name: str) -> Any:
+    """
+    Get parsed company data file, re-reading it only when its mtime changes.
+    
+    Args:
+        name: Source name (company, business, events, geography)
+        
+    Returns:
+        Parsed JSON data (shared - do not modify) or None
+    """
+    version = _data_versions()[name]
+    cached = _json_cache.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    data = load_json_file(_company_sources()[name])
+    _json_cache[name] = (version, data)
+    return data
+
+
+def _get_city_index() -> Optional[CityIndex]:
+    """
+    Get city index over geography data, rebuilt when the file changes.
+    
+    Returns:
+        CityIndex or None if geography data is unavailable
+    """
+    global _city_index_cache
+    
+    version = _data_versions()["geography"]
+    if _city_index_cache is None or _city_index_cache[0] != version:
+        geography_data = _load_company_source("geography")
+        if not isinstance(geography_data, list):
+            return None
+        _city_index_cache = (version, CityIndex(geography_data))
+    return _city_index_cache[1]
+
+
 def get_company_info(info_type: str, city: Optional[str] = None) -> Dict:
     """
     Get company information from JSON files.
     
+    Files are parsed once and cached until they change on disk; returned
+    data is shared and must not be modified.
+    
     Args:
         info_type: Type of info (company, business, events, geography, all)
         city: City name for geography search (optional)
@@ -64,39 +153,76 @@ def get_company_info(info_type: str, city: Optional[str] = None) -> Dict:
     result = {}
     
     if info_type in ["company", "all"]:
-        company_data = load_json_file(config.COMPANY_PATH)
+        company_data = _load_company_source("company")
         if company_data:
             result["company"] = company_data
     
     if info_type in ["business", "all"]:
-        business_data = load_json_file(config.BUSINESS_PATH)
+        business_data = _load_company_source("business")
         if business_data:
             result["business"] = business_data
     
     if info_type in ["events", "all"]:
-        events_data = load_json_file(config.EVENTS_PATH)
+        events_data = _load_company_source("events")
         if events_data:
             result["events"] = events_data
     
     if info_type in ["geography", "all"]:
-        geography_data = load_json_file(config.GEOGRAPHY_PATH)
-        if geography_data:
-            # Filter by city if provided
-            if city and isinstance(geography_data, list):
-                city_lower = city.lower()
-                filtered = [
-                    location for location in geography_data
-                    if city_lower in location.get("city", "").lower()
-                ]
-                result["geography"] = filtered if filtered else geography_data
-            else:
-                result["geography"] = geography_data
+        geography_data = _load_company_source("geography")
+        city_index = _get_city_index() if city else None
+        if city_index:
+            # Only pickup points of the requested city; if there are none,
+            # list the cities that have them instead of every address
+            result["geography"] = city_index.find(city)
+            if not result["geography"]:
+                result["geography_cities"] = city_index.cities
+        elif geography_data:
+            result["geography"] = geography_data
     
     logger.info(f"Retrieved {info_type} info" + (f" for city {city}" if city else ""))
     
     return result
 
 
+def get_company_info_payload(info_type: str, city: Optional[str] = None) -> str:
+    """
+    Get serialized get_company_info tool result.
+    
+    The JSON string is memoized per (info_type, city) and rebuilt only when
+    a company data file changes.
+    
+    Args:
+        info_type: Type of info (company, business, events, geography, all)
+        city: City name for geography search (optional)
+        
+    Returns:
+        Tool result as JSON string
+    """
+    key = (info_type, (city or "").strip().lower(), tuple(_data_versions().values()))
+    payload = _payload_cache.get(key)
+    if payload is not None:
+        _payload_cache.move_to_end(key)
+        return payload
+    
+    info = get_company_info(info_type, city)
+    if info:
+        result = {
+            "status": "success",
+            "data": info
+        }
+    else:
+        result = {
+            "status": "not_found",
+            "message": "Информация не найдена."
+        }
+    
+    payload = json.dumps(result, ensure_ascii=False, indent=2)
+    _payload_cache[key] = payload
+    while len(_payload_cache) > PAYLOAD_CACHE_SIZE:
+        _payload_cache.popitem(last=False)
+    return payload
+
+
 def format_product_for_gpt(product: Dict, short: bool = True) -> str:
     """
     Format product data for GPT context.
@@ -171,14 +297,11 @@ def get_product_by_id(product_id: str) -> Optional[Dict]:
     Returns:
         Product dictionary or None if not found
     """
-    catalog = load_json_file(config.CATALOG_PATH)
-    if not catalog:
-        return None
-    
-    for product in catalog:
-        if product.get("id") == product_id:
-            logger.info(f"Found product: {product.get('name')} ({product_id})")
-            return product
+    from ai.catalog import get_catalog_store
     
-    logger.warning(f"Product {product_id} not found")
-    return None
+    product = get_catalog_store().get(product_id)
+    if product:
+        logger.info(f"Found product: {product.get('name')} ({product_id})")
+    else:
+        logger.warning(f"Product {product_id} not found")
+    return product
@@ -0,0 +1,168 @@
+"""Persistent LRU cache for query embeddings"""
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiosqlite
+import numpy as np
+from loguru import logger
+
+
+class QueryEmbeddingCache:
+    """
+    Two-level cache of query embeddings.
+
+    Level 1 is an in-memory LRU bounded by size and TTL, level 2 is a SQLite
+    table that survives restarts. Entries are keyed by embedding model plus
+    normalized query text; rows for other models are purged on open.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        model: str,
+        max_size: int = 2000,
+        ttl: float = 30 * 24 * 3600
+    ):
+        """
+        Initialize query embeddings cache.
+
+        Args:
+            db_path: Path to SQLite file for the persistent level
+            model: Embedding model the cached vectors belong to
+            max_size: Maximum number of entries kept in memory
+            ttl: Entry lifetime in seconds
+        """
+        self.db_path = db_path
+        self.model = model
+        self.max_size = max_size
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._db: Optional[aiosqlite.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def open(self) -> None:
+        """Open persistent store and drop entries of other models"""
+        if self._db is not None:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.db_path)
+        await self._db.execute("""
+            CREATE TABLE IF NOT EXISTS query_embeddings (
+                model TEXT NOT NULL,
+                query TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, query)
+            )
+        """)
+        cursor = await self._db.execute("""
+            DELETE FROM query_embeddings WHERE model != ? OR created_at < ?
+        """, (self.model, time.time() - self.ttl))
+        await self._db.commit()
+        if cursor.rowcount:
+            logger.info(f"Dropped {cursor.rowcount} stale query embeddings")
+
+    async def close(self) -> None:
+        """Close persistent store"""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize query text for use as a cache key.
+
+        Args:
+            query: Raw query text
+
+        Returns:
+            Lowercased query with collapsed whitespace
+        """
+        return " ".join(query.lower().split())
+
+    async def get(self, query: str) -> Optional[np.ndarray]:
+        """
+        Get cached embedding for query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Embedding vector or None if not cached
+        """
+        key = self.normalize_query(query)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, embedding = entry
+            if now - created_at < self.ttl:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+            del self._memory[key]
+
+        if self._db is not None:
+            async with self._db.execute("""
+                SELECT embedding, created_at FROM query_embeddings
+                WHERE model = ? AND query = ?
+            """, (self.model, key)) as cursor:
+                row = await cursor.fetchone()
+            if row and now - row[1] < self.ttl:
+                embedding = np.frombuffer(row[0], dtype=np.float32)
+                self._remember(key, row[1], embedding)
+                self.disk_hits += 1
+                return embedding
+
+        self.misses += 1
+        return None
+
+    async def put(self, query: str, embedding: np.ndarray) -> None:
+        """
+        Store embedding for query.
+
+        Args:
+            query: Query text
+            embedding: Query embedding vector
+        """
+        key = self.normalize_query(query)
+        created_at = time.time()
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        self._remember(key, created_at, embedding)
+
+        if self._db is not None:
+            try:
+                await self._db.execute("""
+                    INSERT OR REPLACE INTO query_embeddings (model, query, embedding, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (self.model, key, embedding.tobytes(), created_at))
+                await self._db.commit()
+            except Exception as e:
+                logger.error(f"Error saving query embedding: {e}")
+
+    def _remember(self, key: str, created_at: float, embedding: np.ndarray) -> None:
+        """Put entry into the in-memory LRU, evicting the oldest if full"""
+        self._memory[key] = (created_at, embedding)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses and size
+        """
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "size": len(self._memory)
+        }
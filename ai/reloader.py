@@ -0,0 +1,129 @@
+"""Hot reload of catalog data without restarting the bot"""
+import asyncio
+import signal
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+import config
+from ai.catalog import CatalogStore, set_catalog_store
+from ai.embeddings import EmbeddingsSearch, get_embeddings_search, set_embeddings_search
+
+
+class DataReloader:
+    """
+    Watches data files and swaps in a freshly built catalog snapshot.
+
+    The new catalog store and embeddings index are built in the background
+    while the old ones keep serving; the global references are then
+    replaced in one step. Requests that already hold the old snapshot
+    finish on it.
+    """
+
+    def __init__(self, data_dir: Path = config.DATA_DIR, interval: float = config.DATA_RELOAD_INTERVAL):
+        """
+        Initialize reloader.
+
+        Args:
+            data_dir: Directory with data JSON files
+            interval: Polling interval in seconds (0 disables polling)
+        """
+        self.data_dir = data_dir
+        self.interval = interval
+        self._mtimes = self._snapshot()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._signal_task: Optional[asyncio.Task] = None
+
+    def _snapshot(self) -> Dict[Path, int]:
+        """Get modification times of data JSON files"""
+        mtimes = {}
+        for path in self.data_dir.glob("*.json"):
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except OSError:
+                continue
+        return mtimes
+
+    async def reload(self) -> bool:
+        """
+        Rebuild catalog store and embeddings index and swap them in.
+
+        Returns:
+            True if the new snapshot is live, False if reload failed
+        """
+        async with self._lock:
+            try:
+                logger.info("Reloading catalog...")
+                store = await asyncio.to_thread(CatalogStore.load, config.CATALOG_PATH)
+
+                try:
+                    query_cache = get_embeddings_search().query_cache
+                except RuntimeError:
+                    query_cache = None
+                search = EmbeddingsSearch(query_cache=query_cache)
+                await search.initialize(store)
+
+                set_catalog_store(store)
+                set_embeddings_search(search)
+                logger.info(f"✅ Catalog reloaded: {len(store)} products")
+                return True
+
+            except Exception as e:
+                logger.error(f"Catalog reload failed, keeping previous snapshot: {e}")
+                return False
+
+    async def check(self) -> bool:
+        """
+        Reload catalog if its file changed since the last check.
+
+        Returns:
+            True if a reload happened
+        """
+        mtimes = self._snapshot()
+        changed = [path.name for path in mtimes if mtimes[path] != self._mtimes.get(path)]
+        self._mtimes = mtimes
+        if not changed:
+            return False
+
+        logger.info(f"Data files changed: {', '.join(changed)}")
+        if config.CATALOG_PATH.name in changed:
+            return await self.reload()
+        return False
+
+    async def _watch(self):
+        """Poll data files until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Error checking data files: {e}")
+
+    def _on_signal(self):
+        """Schedule reload on SIGHUP"""
+        logger.info("SIGHUP received")
+        self._signal_task = asyncio.create_task(self.reload())
+
+    def start(self):
+        """Start polling data files and listen for SIGHUP"""
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._watch())
+            logger.info(f"Watching {self.data_dir} every {self.interval}s")
+
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self._on_signal)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            # No SIGHUP on Windows
+            pass
+
+    async def stop(self):
+        """Stop polling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,33 @@
+"""Admin command handlers"""
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+from loguru import logger
+
+from ai.reloader import DataReloader
+import config
+
+router = Router()
+
+
+@router.message(Command("reload"))
+async def cmd_reload(message: Message, reloader: DataReloader):
+    """
+    Handle /reload command - rebuilds catalog and search index without restart.
+    
+    Args:
+        message: Telegram message
+        reloader: Data reloader instance
+    """
+    user = message.from_user
+    if user.id not in config.ADMIN_IDS:
+        logger.warning(f"User {user.id} (@{user.username}) tried /reload without permission")
+        return
+    
+    logger.info(f"Admin {user.id} requested data reload")
+    await message.answer("🔄 Обновляю каталог...")
+    
+    if await reloader.reload():
+        await message.answer("✅ Каталог обновлен")
+    else:
+        await message.answer("😔 Не удалось обновить каталог, работает предыдущая версия")
@@ -192,7 +192,7 @@ async def callback_more_products(callback: CallbackQuery, assistant: AIAssistant
         logger.info(f"Loading more products for '{query}', offset={offset}")
         
         # Search products again
-        products = search_products(query, max_results=20)
+        products = await search_products(query, max_results=20)
         
         # Get next 3 products
         next_products = products[offset:offset + 3]
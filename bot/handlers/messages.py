@@ -35,42 +35,24 @@ async def handle_text_message(message: Message, db: Database, assistant: AIAssis
     )
     
     try:
-        # Ensure user exists in database
-        await db.add_user(
+        # Register user, save message and load gender + history at once
+        assistant_gender, history = await db.begin_turn(
             user_id=user.id,
             username=user.username,
-            first_name=user.first_name
-        )
-        
-        # Add user message to database
-        await db.add_message(
-            user_id=user.id,
-            role="user",
-            content=user_text
-        )
-        
-        # Get user's assistant gender preference
-        assistant_gender = await db.get_assistant_gender(user.id)
-        
-        # Get chat history
-        history = await db.get_history(
-            user_id=user.id,
-            limit=config.MAX_HISTORY_MESSAGES
+            first_name=user.first_name,
+            text=user_text,
+            history_limit=config.MAX_HISTORY_MESSAGES
         )
         
         # Get AI response with found products
         ai_response, found_products, search_query = await assistant.get_response(
             user_message=user_text,
-            chat_history=history[:-1],  # Exclude current message
+            chat_history=history,
             assistant_gender=assistant_gender
         )
         
         # Save assistant response to database
-        await db.add_message(
-            user_id=user.id,
-            role="assistant",
-            content=ai_response
-        )
+        await db.finish_turn(user.id, ai_response)
         
         # Check if products were found - add keyboard with numbered buttons + pagination
         keyboard = None
@@ -36,9 +36,15 @@ if not OPENAI_API_KEY:
     OPENAI_API_KEY = "test_key"
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
 # Database
 DATABASE_PATH = DATA_DIR / os.getenv("DATABASE_PATH", "bot_database.db")
+DATABASE_READERS = int(os.getenv("DATABASE_READERS", "2"))  # Читающих соединений в пуле
+# Отложенная пакетная запись сообщений
+DATABASE_WRITE_BEHIND = os.getenv("DATABASE_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+DATABASE_FLUSH_INTERVAL = 0.05  # Макс. ожидание пакета (сек)
+DATABASE_FLUSH_BATCH_SIZE = 100  # Макс. сообщений в транзакции
 
 # Data files
 CATALOG_PATH = DATA_DIR / "mainCatalog.json"  # Полный каталог с сайта
@@ -46,6 +52,27 @@ COMPANY_PATH = DATA_DIR / "company.json"
 BUSINESS_PATH = DATA_DIR / "business.json"
 EVENTS_PATH = DATA_DIR / "events.json"
 GEOGRAPHY_PATH = DATA_DIR / "geography.json"
+COMPANY_DATA_CHECK_INTERVAL = 5  # Как часто проверять изменения файлов компании (сек)
+
+# Product embeddings cache (float32 .npy matrix + .meta.json header)
+EMBEDDINGS_CACHE_PATH = DATA_DIR / "embeddings_cache.npy"
+EMBEDDING_BATCH_SIZE = 256  # Текстов в одном запросе к API
+EMBEDDING_BATCH_TOKENS = 100_000  # Бюджет токенов на один запрос
+EMBEDDING_CONCURRENCY = 4  # Одновременных запросов при индексации
+EMBEDDING_MAX_RETRIES = 5
+EMBEDDING_RETRY_DELAY = 1.0  # Базовая задержка (сек), удваивается с каждой попыткой
+EMBEDDING_CHECKPOINT_INTERVAL = 10  # Как часто сохранять прогресс индексации (сек)
+
+# Query embeddings cache
+QUERY_EMBEDDINGS_CACHE_PATH = DATA_DIR / "query_embeddings.db"
+QUERY_EMBEDDINGS_CACHE_SIZE = 2000  # Записей в памяти
+QUERY_EMBEDDINGS_CACHE_TTL = 30 * 24 * 3600  # Время жизни записи (сек)
+
+# Hot reload of data files (каталог подхватывается без перезапуска)
+DATA_RELOAD_INTERVAL = int(os.getenv("DATA_RELOAD_INTERVAL", "30"))  # Проверка файлов (сек), 0 - выключено
+
+# Admins (Telegram user IDs через запятую) - доступ к /reload
+ADMIN_IDS = {int(x) for x in os.getenv("ADMIN_IDS", "").split(",") if x.strip()}
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,27 +1,148 @@
 """Database module for storing chat history"""
+import asyncio
+from contextlib import asynccontextmanager
 import aiosqlite
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from loguru import logger
 
 
+# Connection settings applied once per pooled connection
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA mmap_size = 67108864",
+)
+# Insert user or refresh their names, returning the gender preference
+UPSERT_USER_SQL = """
+    INSERT INTO users (user_id, username, first_name)
+    VALUES (?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE
+    SET username = excluded.username, first_name = excluded.first_name
+    RETURNING assistant_gender
+"""
+# Last N messages of user in chronological order
+HISTORY_SQL = """
+    SELECT id, role, content FROM (
+        SELECT id, role, content, timestamp
+        FROM messages
+        WHERE user_id = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    ) ORDER BY timestamp ASC
+"""
+INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (user_id, role, content)
+    VALUES (?, ?, ?)
+"""
+# Prepared statements kept per connection (sqlite3 cache keyed by SQL text)
+STATEMENT_CACHE_SIZE = 128
+# Attempts to flush a write-behind batch before its messages are dropped
+FLUSH_ATTEMPTS = 3
+
+
+class PendingMessage:
+    """Message queued for write-behind, with row id assigned when inserted"""
+    
+    __slots__ = ("user_id", "role", "content", "id")
+    
+    def __init__(self, user_id: int, role: str, content: str):
+        self.user_id = user_id
+        self.role = role
+        self.content = content
+        self.id: Optional[int] = None
+
+
 class Database:
-    """SQLite database for storing user chat history"""
+    """
+    SQLite database for storing user chat history.
+    
+    Owns a pool of long-lived connections opened in init_db(): one writer,
+    whose transactions are serialized by a lock, and several read-only
+    readers that run concurrently thanks to WAL mode.
+    
+    In write-behind mode add_message() only queues the message; a single
+    task inserts queued messages in batched transactions, and history
+    reads merge in messages that are not flushed yet.
+    """
     
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        readers: int = 2,
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        flush_batch_size: int = 100
+    ):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            readers: Number of pooled read connections
+            write_behind: Queue messages and write them in batches
+            flush_interval: Max seconds a queued message waits for its batch
+            flush_batch_size: Max messages per batch transaction
         """
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.readers = max(1, readers)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._reader_pool: Optional[asyncio.Queue] = None
+        self._reader_connections: List[aiosqlite.Connection] = []
+        
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_batch_size = max(1, flush_batch_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # Queued messages by user, oldest first
+        self._pending: Dict[int, List[PendingMessage]] = {}
+    
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        """Open pooled connection and configure it"""
+        db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        db.row_factory = aiosqlite.Row
+        for pragma in PRAGMAS:
+            await db.execute(pragma)
+        if read_only:
+            await db.execute("PRAGMA query_only = ON")
+        return db
+    
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Acquire writer connection for one transaction (committed on exit)"""
+        if self._writer is None:
+            raise RuntimeError("Database not initialized! Call init_db() first")
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+    
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Acquire reader connection from the pool"""
+        if self._reader_pool is None:
+            raise RuntimeError("Database not initialized! Call init_db() first")
+        db = await self._reader_pool.get()
+        try:
+            yield db
+        finally:
+            self._reader_pool.put_nowait(db)
     
     async def init_db(self) -> None:
-        """Create tables if they don't exist"""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Open connection pool and create tables if they don't exist"""
+        if self._writer is not None:
+            return
+        self._writer = await self._connect()
+        
+        async with self._write() as db:
             # Users table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -50,9 +171,108 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_messages_user_id 
                 ON messages (user_id, timestamp DESC)
             """)
+        
+        self._reader_pool = asyncio.Queue()
+        for _ in range(self.readers):
+            reader = await self._connect(read_only=True)
+            self._reader_connections.append(reader)
+            self._reader_pool.put_nowait(reader)
+        
+        if self.write_behind:
+            self._queue = asyncio.Queue()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"Database initialized successfully (1 writer, {self.readers} readers"
+            + (", write-behind)" if self.write_behind else ")")
+        )
+    
+    def _enqueue(self, user_id: int, role: str, content: str) -> None:
+        """Queue message for write-behind and make it visible to reads"""
+        message = PendingMessage(user_id, role, content)
+        self._pending.setdefault(user_id, []).append(message)
+        self._queue.put_nowait(message)
+    
+    async def _flush_loop(self) -> None:
+        """Write queued messages in batches until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.flush_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-            await db.commit()
-            logger.info("Database initialized successfully")
+            try:
+                await self._flush_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _flush_batch(self, batch: List[PendingMessage]) -> None:
+        """Insert batch of queued messages in one transaction"""
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            try:
+                async with self._write() as db:
+                    for message in batch:
+                        cursor = await db.execute(
+                            INSERT_MESSAGE_SQL, (message.user_id, message.role, message.content)
+                        )
+                        # Assigned before commit so reads that already see
+                        # the row can skip the pending copy
+                        message.id = cursor.lastrowid
+                break
+            except Exception as e:
+                for message in batch:
+                    message.id = None
+                if attempt == FLUSH_ATTEMPTS:
+                    logger.error(f"Dropping {len(batch)} messages after failed flush: {e}")
+                    break
+                logger.warning(f"Error flushing messages (attempt {attempt}): {e}")
+                await asyncio.sleep(self.flush_interval * attempt)
+        
+        for message in batch:
+            pending = self._pending.get(message.user_id)
+            if pending and message in pending:
+                pending.remove(message)
+                if not pending:
+                    del self._pending[message.user_id]
+        logger.debug(f"Flushed {len(batch)} messages")
+    
+    async def flush(self) -> None:
+        """Wait until all queued messages are written"""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    def _merge_history(
+        self,
+        rows: List[aiosqlite.Row],
+        pending: List[PendingMessage],
+        limit: int
+    ) -> List[Dict[str, str]]:
+        """
+        Merge stored rows with queued messages.
+        
+        Args:
+            rows: Stored messages (id, role, content) in chronological order
+            pending: Queued messages captured before rows were read
+            limit: Maximum number of messages
+            
+        Returns:
+            Last messages in format [{"role": "user", "content": "..."}]
+        """
+        stored_ids = {row["id"] for row in rows}
+        messages = [{"role": row["role"], "content": row["content"]} for row in rows]
+        messages.extend(
+            {"role": message.role, "content": message.content}
+            for message in pending
+            if message.id not in stored_ids
+        )
+        return messages[-limit:] if limit > 0 else []
     
     async def add_user(
         self, 
@@ -68,17 +288,9 @@ class Database:
             username: Telegram username
             first_name: User's first name
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT OR IGNORE INTO users (user_id, username, first_name)
-                VALUES (?, ?, ?)
-            """, (user_id, username, first_name))
-            await db.execute("""
-                UPDATE users 
-                SET username = ?, first_name = ?
-                WHERE user_id = ?
-            """, (username, first_name, user_id))
-            await db.commit()
+        async with self._write() as db:
+            # RETURNING rows must be consumed before commit
+            await db.execute_fetchall(UPSERT_USER_SQL, (user_id, username, first_name))
             logger.debug(f"User {user_id} added/updated in database")
     
     async def set_assistant_gender(self, user_id: int, gender: str) -> None:
@@ -89,13 +301,12 @@ class Database:
             user_id: Telegram user ID
             gender: 'male' or 'female'
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._write() as db:
             await db.execute("""
                 UPDATE users 
                 SET assistant_gender = ?
                 WHERE user_id = ?
             """, (gender, user_id))
-            await db.commit()
             logger.debug(f"User {user_id} set assistant gender to {gender}")
     
     async def get_assistant_gender(self, user_id: int) -> Optional[str]:
@@ -108,7 +319,7 @@ class Database:
         Returns:
             'male', 'female', or None if not set
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._read() as db:
             async with db.execute("""
                 SELECT assistant_gender FROM users WHERE user_id = ?
             """, (user_id,)) as cursor:
@@ -129,12 +340,13 @@ class Database:
             role: Message role (user/assistant/system)
             content: Message content
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO messages (user_id, role, content)
-                VALUES (?, ?, ?)
-            """, (user_id, role, content))
-            await db.commit()
+        if self.write_behind:
+            self._enqueue(user_id, role, content)
+            logger.debug(f"Message from {user_id} ({role}) queued for database")
+            return
+        
+        async with self._write() as db:
+            await db.execute(INSERT_MESSAGE_SQL, (user_id, role, content))
             logger.debug(f"Message from {user_id} ({role}) saved to database")
     
     async def get_history(
@@ -152,25 +364,69 @@ class Database:
         Returns:
             List of messages in format [{"role": "user", "content": "..."}]
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        # Capture queued messages before reading so none is missed if
+        # a flush commits while the query runs
+        pending = list(self._pending.get(user_id, ()))
+        async with self._read() as db:
             # Subquery to get last N messages, then order them chronologically
-            async with db.execute("""
-                SELECT role, content FROM (
-                    SELECT role, content, timestamp
-                    FROM messages
-                    WHERE user_id = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ) ORDER BY timestamp ASC
-            """, (user_id, limit)) as cursor:
+            async with db.execute(HISTORY_SQL, (user_id, limit)) as cursor:
                 rows = await cursor.fetchall()
-                messages = [
-                    {"role": row["role"], "content": row["content"]}
-                    for row in rows
-                ]
-                logger.debug(f"Retrieved {len(messages)} messages for user {user_id}")
-                return messages
+        messages = self._merge_history(rows, pending, limit)
+        logger.debug(f"Retrieved {len(messages)} messages for user {user_id}")
+        return messages
+    
+    async def begin_turn(
+        self,
+        user_id: int,
+        username: Optional[str],
+        first_name: Optional[str],
+        text: str,
+        history_limit: int = 10
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        Start conversation turn in one transaction.
+        
+        Upserts the user, reads their gender preference and previous
+        messages, and stores the new user message.
+        
+        Args:
+            user_id: Telegram user ID
+            username: Telegram username
+            first_name: User's first name
+            text: User message text
+            history_limit: Maximum number of previous messages to retrieve
+            
+        Returns:
+            Tuple of (assistant gender or None, history before this message)
+        """
+        pending = list(self._pending.get(user_id, ()))
+        async with self._write() as db:
+            rows = await db.execute_fetchall(UPSERT_USER_SQL, (user_id, username, first_name))
+            assistant_gender = rows[0][0] if rows else None
+            
+            async with db.execute(HISTORY_SQL, (user_id, history_limit)) as cursor:
+                rows = await cursor.fetchall()
+            history = self._merge_history(rows, pending, history_limit)
+            
+            if not self.write_behind:
+                await db.execute(INSERT_MESSAGE_SQL, (user_id, "user", text))
+        
+        if self.write_behind:
+            # Queued after earlier pending messages of the user to keep order
+            self._enqueue(user_id, "user", text)
+        
+        logger.debug(f"Turn started for user {user_id}: {len(history)} history messages")
+        return assistant_gender, history
+    
+    async def finish_turn(self, user_id: int, reply: str) -> None:
+        """
+        Finish conversation turn by storing assistant reply.
+        
+        Args:
+            user_id: Telegram user ID
+            reply: Assistant response text
+        """
+        await self.add_message(user_id, "assistant", reply)
     
     async def clear_history(self, user_id: int) -> int:
         """
@@ -182,14 +438,14 @@ class Database:
         Returns:
             Number of deleted messages
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        await self.flush()
+        async with self._write() as db:
             cursor = await db.execute("""
                 DELETE FROM messages WHERE user_id = ?
             """, (user_id,))
-            await db.commit()
-            deleted = cursor.rowcount
-            logger.info(f"Cleared {deleted} messages for user {user_id}")
-            return deleted
+        deleted = cursor.rowcount
+        logger.info(f"Cleared {deleted} messages for user {user_id}")
+        return deleted
     
     async def get_user_stats(self, user_id: int) -> Dict[str, any]:
         """
@@ -201,9 +457,7 @@ class Database:
         Returns:
             Dictionary with user statistics
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            
+        async with self._read() as db:
             # Get user info
             async with db.execute("""
                 SELECT username, first_name, created_at
@@ -228,10 +482,29 @@ class Database:
                 "username": user["username"],
                 "first_name": user["first_name"],
                 "registered_at": user["created_at"],
-                "total_messages": count_row["count"] if count_row else 0
+                "total_messages": (count_row["count"] if count_row else 0)
+                + len(self._pending.get(user_id, ()))
             }
     
     async def close(self) -> None:
-        """Close database connection"""
+        """Write queued messages and close pooled connections"""
+        if self._writer is None:
+            return
+        if self._flush_task is not None:
+            await self.flush()
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+            self._queue = None
+        async with self._write_lock:
+            for db in self._reader_connections:
+                await db.close()
+            await self._writer.close()
+        self._writer = None
+        self._reader_pool = None
+        self._reader_connections = []
         logger.info("Database connection closed")
 
@@ -10,7 +10,10 @@ from aiogram.enums import ParseMode
 import config
 from data.database import Database
 from ai.assistant import AIAssistant
-from bot.handlers import start, messages, callbacks, menu, clear, menu_buttons, product_card
+from ai.openai_client import close_openai_client
+from ai.embeddings import close_embeddings_search
+from ai.reloader import DataReloader
+from bot.handlers import start, messages, callbacks, menu, clear, menu_buttons, product_card, admin
 from bot.middlewares.logging import LoggingMiddleware
 
 
@@ -37,7 +40,13 @@ async def main():
     logger.info("=" * 50)
     
     # Initialize database
-    db = Database(config.DATABASE_PATH)
+    db = Database(
+        config.DATABASE_PATH,
+        readers=config.DATABASE_READERS,
+        write_behind=config.DATABASE_WRITE_BEHIND,
+        flush_interval=config.DATABASE_FLUSH_INTERVAL,
+        flush_batch_size=config.DATABASE_FLUSH_BATCH_SIZE
+    )
     await db.init_db()
     logger.info("Database initialized")
     
@@ -45,18 +54,21 @@ async def main():
     assistant = AIAssistant()
     logger.info("AI Assistant initialized")
     
-    # Initialize semantic search embeddings
+    # Initialize product catalog and semantic search embeddings
+    from ai.catalog import initialize_catalog_store
     from ai.embeddings import initialize_embeddings_search
-    from ai.product_search import load_json_file
     
-    logger.info("Loading product catalog for embeddings...")
-    catalog = load_json_file(config.CATALOG_PATH)
-    if catalog:
-        logger.info(f"Initializing semantic search for {len(catalog)} products...")
-        await initialize_embeddings_search(catalog)
+    logger.info("Loading product catalog...")
+    try:
+        catalog_store = initialize_catalog_store(config.CATALOG_PATH)
+    except Exception as e:
+        catalog_store = None
+        logger.error(f"Failed to load catalog: {e}! Search will not work.")
+    
+    if catalog_store:
+        logger.info(f"Initializing semantic search for {len(catalog_store)} products...")
+        await initialize_embeddings_search(catalog_store)
         logger.info("✅ Semantic search initialized successfully!")
-    else:
-        logger.error("Failed to load catalog! Search will not work.")
     
     # Initialize bot
     # Если нужен прокси (для России), раскомментируй следующие строки:
@@ -80,6 +92,7 @@ async def main():
     
     # Register routers
     dp.include_router(start.router)
+    dp.include_router(admin.router)
     dp.include_router(clear.router)
     dp.include_router(menu.router)
     dp.include_router(menu_buttons.router)  # Reply keyboard buttons
@@ -92,6 +105,11 @@ async def main():
     dp["db"] = db
     dp["assistant"] = assistant
     
+    # Watch data files for hot reload
+    reloader = DataReloader()
+    reloader.start()
+    dp["reloader"] = reloader
+    
     # Start polling
     try:
         logger.info("Starting polling...")
@@ -99,7 +117,10 @@ async def main():
     except Exception as e:
         logger.error(f"Error during polling: {e}")
     finally:
+        await reloader.stop()
         await bot.session.close()
+        await close_embeddings_search()
+        await close_openai_client()
         await db.close()
         logger.info("Bot stopped")
 
@@ -0,0 +1,51 @@
+"""Tests for in-memory catalog store"""
+import pytest
+
+import config
+from ai.catalog import CatalogStore, initialize_catalog_store
+from ai.product_search import get_product_by_id
+
+
+@pytest.fixture(scope="module")
+def store():
+    """Load catalog store from the real catalog"""
+    return initialize_catalog_store(config.CATALOG_PATH)
+
+
+def test_lookup_by_all_keys(store):
+    """Test lookups by id, api_id, slug and article"""
+    product = store.get("P003")
+
+    assert product["name"].startswith("BRAINSTORM")
+    assert store.get_by_api_id(product["api_id"]) is product
+    assert store.get_by_slug(product["slug"]) is product
+    assert store.get_by_article(product["article"]) is product
+    assert store.get("P999999") is None
+
+
+def test_category_lists(store):
+    """Test per-category product lists (case-insensitive)"""
+    products = store.get_category("бады")
+
+    assert products
+    assert all(p["category"].lower() == "бады" for p in products)
+    assert store.get_category("нет такой категории") == []
+
+
+def test_get_product_by_id_uses_store(store):
+    """Test product card lookup goes through the shared store"""
+    assert get_product_by_id("P003") is store.get("P003")
+    assert get_product_by_id("P999999") is None
+
+
+def test_store_from_products():
+    """Test building store from a product list"""
+    store = CatalogStore([{"id": "X1", "api_id": 1, "slug": "x", "article": "1-1", "category": "A"}])
+
+    assert len(store) == 1
+    assert store.get("X1")["slug"] == "x"
+    assert store.get_category("a") == [store.get("X1")]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
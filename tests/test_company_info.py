@@ -1,6 +1,12 @@
 """Tests for company info retrieval"""
+import json
+import os
+
 import pytest
-from ai.product_search import get_company_info
+
+import config
+from ai import product_search
+from ai.product_search import get_company_info, get_company_info_payload
 
 
 def test_get_company_info():
@@ -48,6 +54,28 @@ def test_get_geography_by_city():
     assert len(moscow_offices) > 0
 
 
+def test_get_geography_by_declined_and_latin_city():
+    """Test city lookup with case forms, transliteration and typos"""
+    for city in ["в Москве", "Moskva", "Moscow"]:
+        info = get_company_info("geography", city=city)
+        assert info["geography"]
+        assert all(loc["city"] == "Москва" for loc in info["geography"])
+
+    info = get_company_info("geography", city="Казани")
+    assert {loc["city"] for loc in info["geography"]} == {"Казань"}
+
+    info = get_company_info("geography", city="Екатеринбурк")
+    assert {loc["city"] for loc in info["geography"]} == {"Екатеринбург"}
+
+
+def test_get_geography_unknown_city():
+    """Test that an unknown city returns no addresses, only the city list"""
+    info = get_company_info("geography", city="Лондон")
+
+    assert info["geography"] == []
+    assert "Москва" in info["geography_cities"]
+
+
 def test_get_all_info():
     """Test getting all company info at once"""
     info = get_company_info("all")
@@ -58,6 +86,35 @@ def test_get_all_info():
     assert "geography" in info
 
 
+
+def test_company_info_payload_is_memoized():
+    """Test that serialized tool results are reused between calls"""
+    first = get_company_info_payload("company")
+    second = get_company_info_payload("company")
+
+    assert first is second
+    assert json.loads(first)["status"] == "success"
+
+
+def test_company_info_reloaded_when_file_changes(tmp_path, monkeypatch):
+    """Test mtime-based invalidation of parsed data and payloads"""
+    events_path = tmp_path / "events.json"
+    events_path.write_text(json.dumps({"events": [{"city": "Казань"}]}), encoding="utf-8")
+    monkeypatch.setattr(config, "EVENTS_PATH", events_path)
+    monkeypatch.setattr(config, "COMPANY_DATA_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(product_search, "_json_cache", {})
+    monkeypatch.setattr(product_search, "_data_versions_cache", None)
+
+    assert get_company_info("events")["events"]["events"][0]["city"] == "Казань"
+    assert "Казань" in get_company_info_payload("events")
+
+    stat = events_path.stat()
+    events_path.write_text(json.dumps({"events": [{"city": "Сочи"}]}), encoding="utf-8")
+    os.utime(events_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert get_company_info("events")["events"]["events"][0]["city"] == "Сочи"
+    assert "Сочи" in get_company_info_payload("events")
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -112,6 +112,88 @@ async def test_history_limit(test_db):
     assert len(history_all) == 10, "Should return all 10 messages"
 
 
+@pytest.mark.asyncio
+async def test_begin_and_finish_turn(test_db):
+    """Test that a turn registers user, returns prior history and stores messages"""
+    user_id = 345678
+    
+    gender, history = await test_db.begin_turn(user_id, "u", "U", "Hello")
+    assert gender is None
+    assert history == []
+    await test_db.finish_turn(user_id, "Hi there!")
+    
+    await test_db.set_assistant_gender(user_id, "female")
+    gender, history = await test_db.begin_turn(user_id, "renamed", "U", "How are you?", history_limit=10)
+    assert gender == "female"
+    assert [h["content"] for h in history] == ["Hello", "Hi there!"]
+    
+    stats = await test_db.get_user_stats(user_id)
+    assert stats["username"] == "renamed"
+    assert stats["total_messages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_connection_pool(test_db):
+    """Test that connections are persistent, in WAL mode and readers are read-only"""
+    async with test_db._read() as db:
+        async with db.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        with pytest.raises(Exception):
+            await db.execute("DELETE FROM messages")
+    
+    await test_db.add_user(1, "a", "A")
+    results = await asyncio.gather(*[test_db.get_user_stats(1) for _ in range(10)])
+    assert all(stats["username"] == "a" for stats in results)
+    assert test_db._reader_pool.qsize() == test_db.readers
+
+
+@pytest.mark.asyncio
+async def test_write_behind():
+    """Test that queued messages are readable before flush and drained on close"""
+    temp_dir = tempfile.mkdtemp()
+    db_path = Path(temp_dir) / "test.db"
+    db = Database(db_path, write_behind=True, flush_interval=0.01, flush_batch_size=4)
+    await db.init_db()
+    
+    user_id = 555
+    gender, history = await db.begin_turn(user_id, "u", "U", "Msg 0")
+    for i in range(1, 10):
+        await db.add_message(user_id, "user", f"Msg {i}")
+    
+    # Visible right away, in order and without duplicates while flushing
+    for _ in range(5):
+        history = await db.get_history(user_id, limit=100)
+        assert [h["content"] for h in history] == [f"Msg {i}" for i in range(10)]
+        await asyncio.sleep(0.005)
+    
+    await db.flush()
+    assert db._pending == {}
+    assert (await db.get_user_stats(user_id))["total_messages"] == 10
+    
+    await db.add_message(user_id, "assistant", "Last")
+    await db.close()
+    
+    db = Database(db_path)
+    await db.init_db()
+    history = await db.get_history(user_id, limit=1)
+    assert history == [{"role": "assistant", "content": "Last"}]
+    await db.close()
+    os.remove(db_path)
+    os.rmdir(temp_dir)
+
+
+@pytest.mark.asyncio
+async def test_requires_init():
+    """Test that using database before init_db fails clearly"""
+    temp_dir = tempfile.mkdtemp()
+    db = Database(Path(temp_dir) / "test.db")
+    
+    with pytest.raises(RuntimeError):
+        await db.get_history(1)
+    await db.close()
+    os.rmdir(temp_dir)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,199 @@
+"""Tests for the embeddings scoring engine"""
+import numpy as np
+import pytest
+
+from ai.embeddings import EmbeddingsSearch
+from ai.lexical_index import LexicalIndex
+
+
+CATALOG = [
+    {"id": "P001", "name": "Brain"},
+    {"id": "P002", "name": "Sleep"},
+    {"id": "P003", "name": "Skin"},
+    {"id": "P004", "name": "Joints"},
+]
+
+VECTORS = {
+    "мозг": [1.0, 0.0, 0.0],
+    "сон": [0.0, 2.0, 0.0],
+    "ничего": [0.0, 0.0, -1.0],
+}
+
+
+@pytest.fixture
+def search(monkeypatch):
+    """Embeddings search over a tiny fixed catalog without API calls"""
+    engine = EmbeddingsSearch()
+    engine.catalog = CATALOG
+    engine._set_embeddings(np.array([
+        [3.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.6, 0.8, 0.0],
+        [0.0, 0.0, 5.0],
+    ]))
+
+    async def fake_query_embeddings(queries):
+        return engine._normalize([VECTORS[q] for q in queries])
+
+    monkeypatch.setattr(engine, "_get_query_embeddings", fake_query_embeddings)
+    return engine
+
+
+def test_embeddings_are_normalized_float32(search):
+    """Test that embeddings are stored as a contiguous unit-length float32 matrix"""
+    assert search.embeddings.dtype == np.float32
+    assert search.embeddings.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(search.embeddings, axis=1), 1.0)
+
+
+async def test_search_orders_by_similarity(search):
+    """Test that results are sorted by cosine similarity"""
+    results = await search.search("мозг", max_results=5)
+
+    assert [p["id"] for p in results] == ["P001", "P003"]
+    assert results[0]["_similarity_score"] == pytest.approx(1.0)
+    assert results[1]["_similarity_score"] == pytest.approx(0.6)
+
+
+async def test_search_respects_max_results_and_threshold(search):
+    """Test that max_results limits results and low scores are dropped"""
+    assert len(await search.search("сон", max_results=1)) == 1
+    assert await search.search("ничего", max_results=5) == []
+
+
+async def test_search_many_matches_single_search(search):
+    """Test that batch search returns the same results as single searches"""
+    batch = await search.search_many(["мозг", "сон"], max_results=2)
+
+    assert batch == [await search.search("мозг", 2), await search.search("сон", 2)]
+
+
+def test_top_k():
+    """Test top-k selection with argpartition"""
+    scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+
+    assert EmbeddingsSearch._top_k(scores, 2).tolist() == [1, 3]
+    assert EmbeddingsSearch._top_k(scores, 10).tolist() == [1, 3, 2, 0]
+    assert EmbeddingsSearch._top_k(scores, 0).tolist() == []
+
+
+def test_binary_cache_roundtrip(search, tmp_path):
+    """Test that embeddings cache is saved as .npy and loaded memory-mapped"""
+    search.embeddings_cache_path = tmp_path / "embeddings_cache.npy"
+    search.embeddings_meta_path = tmp_path / "embeddings_cache.meta.json"
+    search._save_embeddings_cache()
+
+    loaded = EmbeddingsSearch()
+    loaded.catalog = CATALOG
+    loaded.embeddings_cache_path = search.embeddings_cache_path
+    loaded.embeddings_meta_path = search.embeddings_meta_path
+
+    assert loaded._load_cached_embeddings()
+    assert isinstance(loaded.embeddings, np.memmap)
+    assert np.array_equal(loaded.embeddings, search.embeddings)
+
+
+def test_binary_cache_rejects_changed_content(search, tmp_path):
+    """Test that cache is not used when product content changes"""
+    search.embeddings_cache_path = tmp_path / "embeddings_cache.npy"
+    search.embeddings_meta_path = tmp_path / "embeddings_cache.meta.json"
+    search._save_embeddings_cache()
+
+    search.catalog = [dict(CATALOG[0], name="Brain 2")] + CATALOG[1:]
+
+    assert not search._load_cached_embeddings()
+
+
+
+async def test_incremental_update_embeds_only_changed_products(search, tmp_path, monkeypatch):
+    """Test that only added or changed products are re-embedded"""
+    search.embeddings_cache_path = tmp_path / "embeddings_cache.npy"
+    search.embeddings_meta_path = tmp_path / "embeddings_cache.meta.json"
+    search._save_embeddings_cache()
+    old_embeddings = np.array(search.embeddings)
+
+    embedded = []
+
+    async def fake_embed_texts(texts):
+        embedded.extend(texts)
+        return search._normalize([[1.0, 1.0, 1.0]] * len(texts))
+
+    monkeypatch.setattr(search, "_embed_texts", fake_embed_texts)
+
+    # Reordered, one product changed, one added
+    changed = dict(CATALOG[2], name="Skin Pro")
+    added = {"id": "P005", "name": "Hair"}
+    search.catalog = [CATALOG[3], CATALOG[0], changed, CATALOG[1], added]
+    await search._update_embeddings()
+
+    assert embedded == [search._product_text(changed), search._product_text(added)]
+    assert np.allclose(search.embeddings[0], old_embeddings[3])
+    assert np.allclose(search.embeddings[1], old_embeddings[0])
+    assert np.allclose(search.embeddings[3], old_embeddings[1])
+    assert search.embeddings.shape == (5, 3)
+
+async def test_generation_batches_retries_and_checkpoints(search, tmp_path, monkeypatch):
+    """Test batched generation with a transient error and a resumable checkpoint"""
+    import config
+    from openai import APIConnectionError
+
+    search.embeddings_cache_path = tmp_path / "embeddings_cache.npy"
+    search.embeddings_meta_path = tmp_path / "embeddings_cache.meta.json"
+    monkeypatch.setattr(config, "EMBEDDING_BATCH_SIZE", 1)
+    monkeypatch.setattr(config, "EMBEDDING_CONCURRENCY", 1)
+    monkeypatch.setattr(config, "EMBEDDING_RETRY_DELAY", 0)
+    monkeypatch.setattr(config, "EMBEDDING_CHECKPOINT_INTERVAL", 0)
+
+    calls = []
+
+    async def flaky_embed_texts(texts):
+        calls.append(texts)
+        if len(calls) == 2:
+            raise APIConnectionError(request=None)
+        if len(calls) == 4:
+            raise ValueError("fatal")
+        return search._normalize([[1.0, 0.0, 0.0]] * len(texts))
+
+    monkeypatch.setattr(search, "_embed_texts", flaky_embed_texts)
+
+    with pytest.raises(ValueError):
+        await search._update_embeddings()
+
+    # Finished batches (the second one after a retry) were checkpointed
+    meta, matrix = search._read_embeddings_cache()
+    assert meta["product_ids"][:2] == ["P001", "P002"]
+    assert "P003" not in meta["product_ids"]
+    assert matrix.shape == (len(meta["product_ids"]), 3)
+
+    # Resume embeds only what is not in the checkpoint
+    embedded = []
+
+    async def embed_texts(texts):
+        embedded.extend(texts)
+        return search._normalize([[0.0, 1.0, 0.0]] * len(texts))
+
+    monkeypatch.setattr(search, "_embed_texts", embed_texts)
+    await search._update_embeddings()
+
+    assert search._product_text(CATALOG[2]) in embedded
+    assert search._product_text(CATALOG[0]) not in embedded
+    assert search._product_text(CATALOG[1]) not in embedded
+    assert search.embeddings.shape == (4, 3)
+
+
+
+async def test_strong_lexical_hit_skips_embedding_call(search, monkeypatch):
+    """Test that an exact product name is answered without embedding the query"""
+    search.lexical_index = LexicalIndex(search.catalog)
+
+    async def no_api_call(queries):
+        raise AssertionError("embedding API must not be called")
+
+    monkeypatch.setattr(search, "_get_query_embeddings", no_api_call)
+
+    results = await search.search("Sleep", max_results=5)
+
+    assert [p["id"] for p in results] == ["P002"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,48 @@
+"""Tests for city index"""
+from ai.geography import CityIndex, city_keys, transliterate, trigram_similarity
+
+
+LOCATIONS = [
+    {"city": "Москва", "address": "ул. Тверская, 1"},
+    {"city": "Москва", "address": "пр. Мира, 10"},
+    {"city": "Санкт-Петербург", "address": "Невский пр., 5"},
+    {"city": "Уфа", "address": "ул. Ленина, 3"},
+    {"city": "Орел", "address": "ул. Комсомольская, 7"},
+]
+
+
+def test_city_keys_share_stem_across_case_forms():
+    """Test that declined forms produce a common key"""
+    assert city_keys("Москва") & city_keys("в Москве")
+    assert city_keys("Уфа") & city_keys("Уфе")
+    assert city_keys("Орел") & city_keys("Орле")
+
+
+def test_transliterate():
+    """Test Cyrillic to Latin transliteration"""
+    assert transliterate("казань") == "kazan"
+
+
+def test_trigram_similarity():
+    """Test similarity bounds"""
+    assert trigram_similarity("москва", "москва") == 1.0
+    assert trigram_similarity("москва", "лондон") == 0.0
+
+
+def test_find_by_declined_latin_and_alias():
+    """Test lookups by case form, transliteration and colloquial name"""
+    index = CityIndex(LOCATIONS)
+
+    assert len(index.find("в Москве")) == 2
+    assert len(index.find("Moskva")) == 2
+    assert index.match_cities("спб") == ["Санкт-Петербург"]
+    assert index.match_cities("Уфе") == ["Уфа"]
+
+
+def test_find_fuzzy_and_unknown():
+    """Test typo tolerance and that unknown cities match nothing"""
+    index = CityIndex(LOCATIONS)
+
+    assert index.match_cities("Санкт-Питербург") == ["Санкт-Петербург"]
+    assert index.find("Лондон") == []
+    assert index.find("") == []
@@ -0,0 +1,59 @@
+"""Tests for lexical product index"""
+import pytest
+
+import config
+from ai.lexical_index import LexicalIndex, tokenize
+from ai.product_search import load_json_file
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """Load product catalog"""
+    return load_json_file(config.CATALOG_PATH)
+
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    """Build lexical index over the catalog"""
+    return LexicalIndex(catalog)
+
+
+def test_tokenize_normalizes_russian():
+    """Test lowercasing, ё→е, stopwords and stemming"""
+    assert tokenize("Для суставов и памяти, Ёжик") == ["сустав", "памят", "ежик"]
+    assert tokenize("суставы") == tokenize("суставов")
+    assert tokenize("артикул 1-1020") == ["1-1020"]
+
+
+def test_strong_match_by_name_and_transliteration(index, catalog):
+    """Test that product names and transliterated names are strong hits"""
+    for query in ["BRAINSTORM", "брейншторм", "покажи brainstorm"]:
+        names = [catalog[i]["name"] for i in index.strong_matches(query)]
+        assert names and all("BRAINSTORM" in name for name in names)
+
+
+def test_strong_match_by_article(index, catalog):
+    """Test that an article number finds exactly that product"""
+    hits = index.strong_matches("артикул 1-1020")
+
+    assert [catalog[i]["article"] for i in hits] == ["1-1020"]
+
+
+def test_generic_words_are_not_strong_matches(index):
+    """Test that common words go through semantic search"""
+    assert index.strong_matches("мозг") == []
+    assert index.strong_matches("коллаген") == []
+    assert index.strong_matches("абсолютно несуществующий продукт xyz123") == []
+
+
+def test_relevance_ranks_name_matches_first(index, catalog):
+    """Test BM25 relevance ranking"""
+    relevance = index.relevance("коллаген")
+    best = catalog[int(relevance.argmax())]
+
+    assert "COLLAGEN" in best["name"]
+    assert 0.0 <= relevance.min() and relevance.max() == pytest.approx(1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,73 @@
+"""Tests for query embeddings cache"""
+import numpy as np
+import pytest
+
+from ai.query_cache import QueryEmbeddingCache
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    """Create query cache backed by a temporary SQLite file"""
+    cache = QueryEmbeddingCache(tmp_path / "queries.db", model="model-a", max_size=2)
+    await cache.open()
+    yield cache
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_get_put_and_counters(cache):
+    """Test cache hits, misses and query normalization"""
+    assert await cache.get("мозг память") is None
+
+    await cache.put("мозг память", np.array([1.0, 0.0]))
+    embedding = await cache.get("  Мозг   ПАМЯТЬ ")
+
+    assert embedding.dtype == np.float32
+    assert embedding.tolist() == [1.0, 0.0]
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_falls_back_to_disk(cache):
+    """Test that entries evicted from memory are still served from disk"""
+    await cache.put("a", np.array([1.0]))
+    await cache.put("b", np.array([2.0]))
+    await cache.put("c", np.array([3.0]))
+
+    assert "a" not in cache._memory
+    assert (await cache.get("a")).tolist() == [1.0]
+    assert cache.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_persists_across_restarts_and_invalidates_on_model_change(cache, tmp_path):
+    """Test that entries survive reopening and are dropped for a new model"""
+    await cache.put("коллаген", np.array([0.5, 0.5]))
+    await cache.close()
+
+    same_model = QueryEmbeddingCache(tmp_path / "queries.db", model="model-a")
+    await same_model.open()
+    assert (await same_model.get("коллаген")).tolist() == [0.5, 0.5]
+    await same_model.close()
+
+    new_model = QueryEmbeddingCache(tmp_path / "queries.db", model="model-b")
+    await new_model.open()
+    assert await new_model.get("коллаген") is None
+    await new_model.close()
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(tmp_path):
+    """Test that expired entries are not returned"""
+    cache = QueryEmbeddingCache(tmp_path / "queries.db", model="model-a", ttl=0)
+    await cache.open()
+
+    await cache.put("для суставов", np.array([1.0]))
+
+    assert await cache.get("для суставов") is None
+    await cache.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""Tests for catalog hot reload"""
+import json
+import os
+
+import pytest
+
+import config
+from ai import catalog, embeddings
+from ai.embeddings import EmbeddingsSearch
+from ai.reloader import DataReloader
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Temporary data directory with a one-product catalog"""
+    catalog_path = tmp_path / "mainCatalog.json"
+    catalog_path.write_text(json.dumps([{"id": "P001", "name": "Old"}]), encoding="utf-8")
+    monkeypatch.setattr(config, "CATALOG_PATH", catalog_path)
+
+    async def fake_initialize(self, store):
+        self.catalog = store.products
+
+    monkeypatch.setattr(EmbeddingsSearch, "initialize", fake_initialize)
+    monkeypatch.setattr(catalog, "_catalog_store", None)
+    monkeypatch.setattr(embeddings, "_embeddings_search", None)
+    return tmp_path
+
+
+def touch_catalog(data_dir, products):
+    """Rewrite catalog file with a newer modification time"""
+    path = data_dir / "mainCatalog.json"
+    stat = path.stat()
+    path.write_text(json.dumps(products), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_catalog_and_search(data_dir):
+    """Test that a changed catalog file is picked up and swapped in"""
+    reloader = DataReloader(data_dir=data_dir, interval=0)
+    assert await reloader.check() is False
+
+    touch_catalog(data_dir, [{"id": "P001", "name": "New"}, {"id": "P002", "name": "Added"}])
+    assert await reloader.check() is True
+
+    assert catalog.get_catalog_store().get("P001")["name"] == "New"
+    assert len(embeddings.get_embeddings_search().catalog) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_previous_snapshot(data_dir):
+    """Test that a broken catalog file does not replace the live snapshot"""
+    reloader = DataReloader(data_dir=data_dir, interval=0)
+    assert await reloader.reload() is True
+    live_store = catalog.get_catalog_store()
+
+    (data_dir / "mainCatalog.json").write_text("[{broken", encoding="utf-8")
+
+    assert await reloader.reload() is False
+    assert catalog.get_catalog_store() is live_store
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])